@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Strike Team OS - Synthetic Fleet Simulator
+Mission: Fake TCP/RESP/HTTP endpoints for exercising the service monitor at scale
+
+Starts local endpoints that behave like the 18xxx database services as seen by
+ServiceMonitor: plain TCP listeners, RESP servers that answer PING, and HTTP
+servers exposing /health. Each endpoint can be given response latency, a
+failure rate and a flapping pattern (listener periodically closed and
+reopened), so sweeps can be observed against hundreds of slow or unstable
+targets without touching real databases.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import signal
+import sys
+from datetime import datetime
+
+PROTOCOLS = ('tcp', 'resp', 'http')
+
+
+class SimulatedEndpoint:
+    REBIND_DELAY = 0.1  # seconds between attempts to reclaim a port after an outage
+    REBIND_TIMEOUT = 5.0  # give up on the port after this long; the next outage tries again
+
+    def __init__(self, name, protocol, host='127.0.0.1', port=0, latency=0.0,
+                 jitter=0.0, failure_rate=0.0, flap_period=0.0, flap_downtime=None,
+                 tcp_outage=1.0, rng=None):
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"Unknown protocol: {protocol}")
+
+        self.name = name
+        self.protocol = protocol
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.flap_period = flap_period
+        self.flap_downtime = flap_downtime if flap_downtime is not None else flap_period / 2
+        self.tcp_outage = tcp_outage
+        self.rng = rng or random.Random()
+
+        self.server = None
+        self.tasks = set()
+        self.outage_lock = asyncio.Lock()
+        self.requests_served = 0
+        self.failures_injected = 0
+        self.transitions = 0
+        self.bind_errors = 0
+        self.rebind_failures = 0
+
+    @property
+    def is_up(self):
+        return self.server is not None
+
+    async def listen(self):
+        """Open the listener; the first call pins an ephemeral port for reopens"""
+        self.server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, reuse_address=True
+        )
+        if self.port == 0:
+            self.port = self.server.sockets[0].getsockname()[1]
+
+    async def start(self):
+        await self.listen()
+        if self.flap_period > 0:
+            self.spawn(self.flap_loop())
+
+    def spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def go_down(self):
+        """Close the listener so new connections are refused"""
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+
+    async def reopen(self):
+        """Rebind the pinned port, retrying for up to REBIND_TIMEOUT seconds"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.REBIND_TIMEOUT
+        while True:
+            try:
+                await self.listen()
+                return True
+            except OSError:
+                # An ephemeral port can be grabbed by any socket while we are down,
+                # including the monitor's own outgoing connections
+                self.bind_errors += 1
+                if loop.time() >= deadline:
+                    self.rebind_failures += 1
+                    print(f"WARNING: {self.name} could not reclaim port {self.port}", file=sys.stderr)
+                    return False
+                await asyncio.sleep(self.REBIND_DELAY)
+
+    async def outage(self, duration):
+        async with self.outage_lock:
+            self.go_down()
+            self.transitions += 1
+            await asyncio.sleep(duration)
+            if await self.reopen():
+                self.transitions += 1
+
+    async def stop(self):
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.server is not None:
+            server = self.server
+            self.go_down()
+            await server.wait_closed()
+
+    async def flap_loop(self):
+        """Alternate between up and down; start offset is randomised per endpoint"""
+        uptime = max(self.flap_period - self.flap_downtime, 0.0)
+        await asyncio.sleep(self.rng.uniform(0, self.flap_period))
+        while True:
+            await self.outage(self.flap_downtime)
+            await asyncio.sleep(uptime)
+
+    async def respond_delay(self):
+        delay = self.latency
+        if self.jitter:
+            delay += self.rng.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def should_fail(self):
+        return self.failure_rate > 0 and self.rng.random() < self.failure_rate
+
+    async def handle_connection(self, reader, writer):
+        self.requests_served += 1
+        try:
+            if self.protocol == 'resp':
+                await self.handle_resp(reader, writer)
+            elif self.protocol == 'http':
+                await self.handle_http(reader, writer)
+            else:
+                await self.handle_tcp(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_tcp(self, reader, writer):
+        # A connect-only probe has already succeeded by the time we get here, so
+        # a failure takes the listener down and the following probes are refused.
+        if self.should_fail():
+            self.failures_injected += 1
+            if not self.outage_lock.locked():
+                self.spawn(self.outage(self.tcp_outage))
+            return
+        await reader.read(1024)
+
+    async def handle_resp(self, reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+
+            # Accept both inline commands and RESP arrays of bulk strings
+            if line.startswith(b'*'):
+                try:
+                    count = int(line[1:].strip() or 0)
+                except ValueError:
+                    writer.write(b'-ERR protocol error\r\n')
+                    await writer.drain()
+                    return
+                parts = []
+                for _ in range(count):
+                    await reader.readline()
+                    parts.append((await reader.readline()).strip())
+            else:
+                parts = line.split()
+            command = parts[0].upper() if parts else b''
+
+            await self.respond_delay()
+            if self.should_fail():
+                self.failures_injected += 1
+                writer.write(b'-ERR simulated failure\r\n')
+            elif command == b'PING':
+                writer.write(b'+PONG\r\n')
+            elif command == b'QUIT':
+                writer.write(b'+OK\r\n')
+                await writer.drain()
+                return
+            else:
+                writer.write(b'-ERR unknown command\r\n')
+            await writer.drain()
+
+    async def handle_http(self, reader, writer):
+        request_line = await reader.readline()
+        while True:
+            header = await reader.readline()
+            if header in (b'\r\n', b'\n', b''):
+                break
+
+        parts = request_line.decode('latin-1').split()
+        path = parts[1] if len(parts) > 1 else '/'
+
+        await self.respond_delay()
+        if self.should_fail():
+            self.failures_injected += 1
+            status, body = '503 Service Unavailable', {'status': 'error', 'details': 'simulated failure'}
+        elif path in ('/', '/health'):
+            status, body = '200 OK', {'status': 'ok', 'endpoint': self.name}
+        else:
+            status, body = '404 Not Found', {'error': 'not found'}
+
+        payload = json.dumps(body).encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: close\r\n\r\n".encode() + payload
+        )
+        await writer.drain()
+
+    def describe(self):
+        description = {
+            'name': self.name,
+            'protocol': self.protocol,
+            'host': self.host,
+            'port': self.port,
+            'latency': self.latency,
+            'jitter': self.jitter,
+            'failure_rate': self.failure_rate,
+            'flap_period': self.flap_period,
+            'flap_downtime': self.flap_downtime if self.flap_period > 0 else 0.0
+        }
+        if self.protocol == 'tcp':
+            # Connect-only probes never see response latency
+            description['latency'] = description['jitter'] = 0.0
+            description['tcp_outage'] = self.tcp_outage
+        return description
+
+    def stats(self):
+        return {
+            'up': self.is_up,
+            'requests_served': self.requests_served,
+            'failures_injected': self.failures_injected,
+            'transitions': self.transitions,
+            'bind_errors': self.bind_errors,
+            'rebind_failures': self.rebind_failures
+        }
+
+
+class FleetSimulator:
+    def __init__(self, endpoints=10, mix=None, host='127.0.0.1', base_port=0,
+                 latency=0.0, jitter=0.0, failure_rate=0.0, flap_fraction=0.0,
+                 flap_period=10.0, flap_downtime=None, tcp_outage=1.0, seed=None):
+        self.host = host
+        self.rng = random.Random(seed)
+        self.endpoints = []
+
+        mix = mix or {'tcp': 1.0}
+        protocols = self.assign_protocols(endpoints, mix)
+        flapping = set(self.rng.sample(range(endpoints), int(round(endpoints * flap_fraction))))
+
+        for index, protocol in enumerate(protocols):
+            self.endpoints.append(SimulatedEndpoint(
+                name=f"sim-{protocol}-{index:04d}",
+                protocol=protocol,
+                host=host,
+                port=base_port + index if base_port else 0,
+                latency=latency,
+                jitter=jitter,
+                failure_rate=failure_rate,
+                flap_period=flap_period if index in flapping else 0.0,
+                flap_downtime=flap_downtime,
+                tcp_outage=tcp_outage,
+                rng=random.Random(self.rng.random())
+            ))
+
+        self.warnings = []
+        if 'tcp' in protocols:
+            if latency or jitter:
+                self.warnings.append(
+                    "latency/jitter do not apply to tcp endpoints: a connect-only probe "
+                    "completes in the kernel before the simulator sees the connection"
+                )
+            if failure_rate:
+                self.warnings.append(
+                    f"tcp endpoints fail by closing their listener for {tcp_outage}s, "
+                    f"so the probes after a failed one are refused, not the failed one itself"
+                )
+
+    def assign_protocols(self, count, mix):
+        """Split count endpoints across protocols in proportion to mix weights"""
+        unknown = set(mix) - set(PROTOCOLS)
+        if unknown:
+            raise ValueError(f"Unknown protocols in mix: {', '.join(sorted(unknown))}")
+
+        total = sum(mix.values())
+        if total <= 0:
+            raise ValueError("Protocol mix weights must sum to a positive value")
+
+        protocols = []
+        for protocol, weight in mix.items():
+            protocols.extend([protocol] * int(count * weight / total))
+        # Hand rounding leftovers to the heaviest protocol
+        heaviest = max(mix, key=mix.get)
+        protocols.extend([heaviest] * (count - len(protocols)))
+        return protocols
+
+    async def start(self):
+        for endpoint in self.endpoints:
+            await endpoint.start()
+
+    async def stop(self):
+        await asyncio.gather(*(endpoint.stop() for endpoint in self.endpoints))
+
+    def service_ports(self):
+        """Port mapping in the shape ServiceMonitor.service_ports expects"""
+        return {endpoint.name: endpoint.port for endpoint in self.endpoints}
+
+    def get_manifest(self):
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'host': self.host,
+            'endpoint_count': len(self.endpoints),
+            'warnings': self.warnings,
+            'endpoints': [endpoint.describe() for endpoint in self.endpoints]
+        }
+
+    def get_stats(self):
+        endpoints = {endpoint.name: endpoint.stats() for endpoint in self.endpoints}
+        totals = {}
+        for key in ('requests_served', 'failures_injected', 'transitions', 'bind_errors',
+                    'rebind_failures'):
+            totals[key] = sum(stats[key] for stats in endpoints.values())
+        return {'totals': totals, 'endpoints': endpoints}
+
+
+def parse_mix(value):
+    """Parse 'tcp=2,resp=1,http=1' into a weight mapping"""
+    mix = {}
+    for item in value.split(','):
+        protocol, _, weight = item.partition('=')
+        mix[protocol.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Run a synthetic fleet of fake database endpoints')
+    parser.add_argument('--endpoints', type=int, default=10, help='Number of endpoints to start')
+    parser.add_argument('--mix', type=parse_mix, default='tcp=2,resp=1,http=1',
+                        help='Protocol weights, e.g. tcp=2,resp=1,http=1')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--base-port', type=int, default=0,
+                        help='First port to bind (consecutive); 0 picks ephemeral ports')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Response latency in seconds (resp/http only; tcp probes never see it)')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Extra random latency, up to this many seconds (resp/http only)')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='Probability a request gets an error reply; on tcp endpoints '
+                             'a failure closes the listener for --tcp-outage seconds')
+    parser.add_argument('--tcp-outage', type=float, default=1.0,
+                        help='Seconds a tcp endpoint stays down after a failure roll')
+    parser.add_argument('--flap-fraction', type=float, default=0.0, help='Fraction of endpoints that flap')
+    parser.add_argument('--flap-period', type=float, default=10.0, help='Seconds per down/up flap cycle')
+    parser.add_argument('--flap-downtime', type=float, default=None,
+                        help='Seconds down per cycle (default: half the period)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--manifest', help='Also write the endpoint manifest to this file')
+    return parser
+
+
+async def run_fleet(args):
+    fleet = FleetSimulator(
+        endpoints=args.endpoints,
+        mix=args.mix,
+        host=args.host,
+        base_port=args.base_port,
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        flap_fraction=args.flap_fraction,
+        flap_period=args.flap_period,
+        flap_downtime=args.flap_downtime,
+        tcp_outage=args.tcp_outage,
+        seed=args.seed
+    )
+    await fleet.start()
+
+    manifest = fleet.get_manifest()
+    if args.manifest:
+        with open(args.manifest, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    # The manifest is the first stdout line so callers can spawn us and read ports back
+    print(json.dumps(manifest), flush=True)
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    for warning in fleet.warnings:
+        print(f"WARNING: {warning}", file=sys.stderr)
+    print(f"Fleet simulator running {len(fleet.endpoints)} endpoints on {args.host}", file=sys.stderr)
+    await stop_event.wait()
+
+    await fleet.stop()
+    stats = fleet.get_stats()
+    # Final stdout line: per-endpoint counters for the caller that spawned us
+    print(json.dumps(stats), flush=True)
+    print(f"Fleet simulator stopped after serving {stats['totals']['requests_served']} connections",
+          file=sys.stderr)
+
+
+def main():
+    """Main function to start the fleet simulator"""
+    args = build_parser().parse_args()
+    asyncio.run(run_fleet(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Strike Team OS - Service Monitor Scaling Benchmark
+Mission: Measure ServiceMonitor and dashboard API cost as the fleet grows
+
+For each endpoint count the benchmark spawns fleet_simulator.py in a separate
+process (so its CPU and memory stay out of the numbers), points a stock
+ServiceMonitor at the simulated ports and protocols and records sweep
+duration, CPU time, RSS memory, the status transitions the monitor observed
+and /api latency. Results are written as JSON; pass --baseline to compare
+against a previous run with the same configuration and fail on regressions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from http.server import HTTPServer
+
+from fleet_simulator import parse_mix
+from monitoring_dashboard import ServiceMonitor, DashboardHTTPHandler
+
+SIMULATOR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fleet_simulator.py')
+
+# Metrics compared against a baseline run; higher is worse for all of them.
+# Each has an absolute floor so run-to-run noise on tiny values is not flagged.
+REGRESSION_METRICS = [
+    ('sweep', 'median_seconds', 0.01),
+    ('sweep', 'cpu_seconds_median', 0.01),
+    ('memory', 'rss_kb_delta', 1024),
+    ('api', 'p95_ms', 2.0)
+]
+
+# Config keys that may differ between a run and its baseline
+COMPARABLE_CONFIG_EXEMPT = ('counts',)
+
+# Environment keys that must match for a baseline to be comparable
+COMPARABLE_ENVIRONMENT = ('cpu_count', 'redis_cli_present')
+
+
+class QuietDashboardHTTPHandler(DashboardHTTPHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def current_rss_kb():
+    """Resident set size of this process in KB (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def start_fleet(count, args):
+    """Spawn the simulator and return (process, manifest) once it is listening"""
+    command = [
+        sys.executable, SIMULATOR_PATH,
+        '--endpoints', str(count),
+        '--mix', args.mix,
+        '--latency', str(args.latency),
+        '--jitter', str(args.jitter),
+        '--failure-rate', str(args.failure_rate),
+        '--flap-fraction', str(args.flap_fraction),
+        '--flap-period', str(args.flap_period),
+        '--tcp-outage', str(args.tcp_outage)
+    ]
+    if args.flap_downtime is not None:
+        command += ['--flap-downtime', str(args.flap_downtime)]
+    if args.seed is not None:
+        command += ['--seed', str(args.seed)]
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line:
+        process.wait()
+        raise RuntimeError(f"Fleet simulator exited with code {process.returncode} before reporting ports")
+    return process, json.loads(line)
+
+
+def stop_fleet(process):
+    """Stop the simulator and return the counters it reports on shutdown"""
+    process.terminate()
+    try:
+        output, _ = process.communicate(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        return {}
+
+    lines = [line for line in output.splitlines() if line.strip()]
+    return json.loads(lines[-1]).get('totals', {}) if lines else {}
+
+
+def measure_sweeps(monitor, sweeps, interval):
+    durations = []
+    cpu_times = []
+    status_counts = {}
+    transitions = {}
+    previous = {}
+
+    for run in range(sweeps):
+        if run and interval:
+            time.sleep(interval)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        monitor.update_service_status()
+        cpu_times.append(time.process_time() - cpu_start)
+        durations.append(time.perf_counter() - wall_start)
+
+        for name, info in monitor.service_status.items():
+            status_counts[info['status']] = status_counts.get(info['status'], 0) + 1
+            if name in previous and previous[name] != info['status']:
+                transitions[name] = transitions.get(name, 0) + 1
+            previous[name] = info['status']
+
+    final_statuses = {}
+    for status in previous.values():
+        final_statuses[status] = final_statuses.get(status, 0) + 1
+
+    return {
+        'runs': sweeps,
+        'interval_seconds': interval,
+        'durations_seconds': durations,
+        'mean_seconds': statistics.mean(durations),
+        'median_seconds': statistics.median(durations),
+        'max_seconds': max(durations),
+        'per_endpoint_ms': statistics.median(durations) / max(len(monitor.service_ports), 1) * 1000,
+        'cpu_seconds': cpu_times,
+        'cpu_seconds_median': statistics.median(cpu_times),
+        'status_counts': status_counts,
+        'observed_transitions': sum(transitions.values()),
+        'endpoints_with_transitions': len(transitions),
+        'final_statuses': final_statuses
+    }
+
+
+def measure_api(monitor, api_requests):
+    """Serve the dashboard on an ephemeral port and time /api requests"""
+    def handler(*args, **kwargs):
+        return QuietDashboardHTTPHandler(*args, monitor=monitor, **kwargs)
+
+    server = HTTPServer(('127.0.0.1', 0), handler)
+    port = server.server_address[1]
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    results = {}
+    all_latencies = []
+    try:
+        for path in ('/api/status', '/api/services'):
+            latencies = []
+            response_bytes = 0
+            for _ in range(api_requests):
+                start = time.perf_counter()
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=30) as response:
+                    response_bytes = len(response.read())
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            all_latencies.extend(latencies)
+            results[path] = {
+                'requests': api_requests,
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'max_ms': max(latencies),
+                'response_bytes': response_bytes
+            }
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    results['p50_ms'] = percentile(all_latencies, 50)
+    results['p95_ms'] = percentile(all_latencies, 95)
+    return results
+
+
+def run_scale_point(count, args):
+    print(f"Benchmarking {count} endpoints...")
+    process, manifest = start_fleet(count, args)
+    try:
+        rss_before = current_rss_kb()
+        monitor = ServiceMonitor(
+            service_ports={e['name']: e['port'] for e in manifest['endpoints']},
+            service_protocols={e['name']: e['protocol'] for e in manifest['endpoints']}
+        )
+        sweep = measure_sweeps(monitor, args.sweeps, args.sweep_interval)
+        rss_after = current_rss_kb()
+        api = measure_api(monitor, args.api_requests)
+    finally:
+        simulator = stop_fleet(process)
+
+    protocols = {}
+    for endpoint in manifest['endpoints']:
+        protocols[endpoint['protocol']] = protocols.get(endpoint['protocol'], 0) + 1
+
+    # Port contention means outages lasted longer than configured, so the
+    # transitions the monitor saw are not the ones we asked the simulator for
+    flags = []
+    if 'bind_errors' not in simulator:
+        flags.append('simulator counters unavailable')
+    elif simulator['bind_errors']:
+        flags.append(f"{simulator['bind_errors']} bind errors, "
+                     f"{simulator['rebind_failures']} ports not reclaimed")
+    for flag in flags:
+        print(f"  WARNING: {flag}")
+
+    print(f"  sweep median {sweep['median_seconds']:.3f}s, cpu {sweep['cpu_seconds_median']:.3f}s, "
+          f"rss +{rss_after - rss_before} KB, api p95 {api['p95_ms']:.1f}ms, "
+          f"{sweep['observed_transitions']} status transitions observed")
+
+    return {
+        'endpoints': count,
+        'protocols': protocols,
+        'sweep': sweep,
+        'memory': {
+            'rss_kb_before': rss_before,
+            'rss_kb_after': rss_after,
+            'rss_kb_delta': rss_after - rss_before
+        },
+        'api': api,
+        'simulator': dict(simulator, warnings=manifest.get('warnings', [])),
+        'flags': flags
+    }
+
+
+def config_differences(report, baseline):
+    """Settings that make two runs incomparable, as {key: (baseline, current)}"""
+    config = report['config']
+    baseline_config = baseline.get('config', {})
+    keys = (set(config) | set(baseline_config)) - set(COMPARABLE_CONFIG_EXEMPT)
+    differences = {
+        key: (baseline_config.get(key), config.get(key))
+        for key in sorted(keys)
+        if config.get(key) != baseline_config.get(key)
+    }
+
+    environment = report['environment']
+    baseline_environment = baseline.get('environment', {})
+    for key in COMPARABLE_ENVIRONMENT:
+        if environment.get(key) != baseline_environment.get(key):
+            differences[f"environment.{key}"] = (baseline_environment.get(key), environment.get(key))
+
+    return differences
+
+
+def compare_to_baseline(report, baseline, tolerance):
+    """Return regressions where a metric grew by more than tolerance (fraction) and its floor"""
+    baseline_points = {point['endpoints']: point for point in baseline.get('results', [])}
+    regressions = []
+
+    for point in report['results']:
+        previous = baseline_points.get(point['endpoints'])
+        if previous is None:
+            continue
+
+        for section, metric, floor in REGRESSION_METRICS:
+            old = previous.get(section, {}).get(metric)
+            new = point[section][metric]
+            if old is None or new - old <= floor:
+                continue
+            if old > 0 and (new - old) / old <= tolerance:
+                continue
+            regressions.append({
+                'endpoints': point['endpoints'],
+                'metric': f"{section}.{metric}",
+                'baseline': old,
+                'current': new,
+                'change_percentage': (new - old) / old * 100 if old > 0 else None
+            })
+
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Benchmark ServiceMonitor against a simulated fleet')
+    parser.add_argument('--counts', default='10,50,100,250,500',
+                        help='Comma-separated endpoint counts to benchmark')
+    parser.add_argument('--sweeps', type=int, default=7, help='Monitor sweeps per endpoint count')
+    parser.add_argument('--sweep-interval', type=float, default=None,
+                        help='Seconds between sweeps (default: 0, or a quarter of the flap '
+                             'period when endpoints flap)')
+    parser.add_argument('--api-requests', type=int, default=20, help='Requests per API endpoint')
+    parser.add_argument('--mix', default='tcp=2,resp=1,http=1', help='Simulator protocol weights')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--flap-fraction', type=float, default=0.0)
+    parser.add_argument('--flap-period', type=float, default=10.0)
+    parser.add_argument('--flap-downtime', type=float, default=None)
+    parser.add_argument('--tcp-outage', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None,
+                        help='Results file (default: monitor-benchmark-<timestamp>.json)')
+    parser.add_argument('--baseline', help='Previous results file to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed fractional increase over baseline before failing')
+    return parser
+
+
+def main():
+    """Main function to run the scaling benchmark"""
+    args = build_parser().parse_args()
+    counts = [int(c) for c in args.counts.split(',') if c.strip()]
+    if args.sweep_interval is None:
+        # Sample each flap cycle several times so flapping endpoints are actually seen down
+        args.sweep_interval = args.flap_period / 4 if args.flap_fraction else 0.0
+    if args.flap_fraction and args.sweep_interval * (args.sweeps - 1) < args.flap_period:
+        print(f"WARNING: {args.sweeps} sweeps {args.sweep_interval}s apart span less than one "
+              f"{args.flap_period}s flap period; flapping may not be observed")
+
+    redis_cli = shutil.which('redis-cli')
+    if parse_mix(args.mix).get('resp', 0) > 0 and redis_cli is None:
+        print("ERROR: redis-cli not found; every resp probe would fail. "
+              "Install redis-cli or drop resp from --mix")
+        return False
+
+    print("Starting Strike Team OS Service Monitor scaling benchmark...")
+    report = {
+        'benchmark': 'service_monitor_scaling',
+        'timestamp': datetime.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'redis_cli': redis_cli,
+            'redis_cli_present': redis_cli is not None
+        },
+        'config': {
+            'counts': counts,
+            'sweeps': args.sweeps,
+            'sweep_interval': args.sweep_interval,
+            'api_requests': args.api_requests,
+            'mix': args.mix,
+            'latency': args.latency,
+            'jitter': args.jitter,
+            'failure_rate': args.failure_rate,
+            'flap_fraction': args.flap_fraction,
+            'flap_period': args.flap_period,
+            'flap_downtime': args.flap_downtime,
+            'tcp_outage': args.tcp_outage,
+            'seed': args.seed
+        },
+        'results': [run_scale_point(count, args) for count in counts]
+    }
+
+    regressions = []
+    differences = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        differences = config_differences(report, baseline)
+        if not differences:
+            regressions = compare_to_baseline(report, baseline, args.tolerance)
+        report['baseline'] = {
+            'file': args.baseline,
+            'tolerance': args.tolerance,
+            'compared': not differences,
+            'config_differences': differences,
+            'regressions': regressions
+        }
+
+    flagged = {point['endpoints']: point['flags'] for point in report['results'] if point['flags']}
+    report['flagged_points'] = flagged
+
+    output = args.output or f"monitor-benchmark-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to: {output}")
+
+    if differences:
+        print("\n=== BASELINE NOT COMPARABLE ===")
+        for key, (old, new) in differences.items():
+            print(f"- {key}: baseline {old!r}, current {new!r}")
+
+    if regressions:
+        print("\n=== PERFORMANCE REGRESSIONS ===")
+        for r in regressions:
+            change = f" (+{r['change_percentage']:.1f}%)" if r['change_percentage'] is not None else ""
+            print(f"- {r['endpoints']} endpoints {r['metric']}: "
+                  f"{r['baseline']:.4g} -> {r['current']:.4g}{change}")
+
+    if flagged:
+        print("\n=== UNRELIABLE RESULTS ===")
+        for count, flags in flagged.items():
+            print(f"- {count} endpoints: {'; '.join(flags)}")
+
+    return not regressions and not differences and not flagged
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -18,8 +18,8 @@ import urllib.parse
 import os
 
 class ServiceMonitor:
-    def __init__(self):
-        self.service_ports = {
+    def __init__(self, service_ports=None, service_protocols=None):
+        self.service_ports = service_ports if service_ports is not None else {
             'dragonfly': 18000,
             'redis': 18010,
             'postgresql': 18020,
@@ -38,6 +38,9 @@ class ServiceMonitor:
             'haystack': 18240,
             'weaviate': 18110
         }
+        # Optional 'resp' / 'http' / 'tcp' opt-in for services not recognised by name;
+        # these get a strict check where a bad reply is reported as 'error'
+        self.service_protocols = service_protocols or {}
 
         self.service_status = {}
         self.service_history = {}
@@ -54,10 +57,54 @@ class ServiceMonitor:
         except:
             return False
 
+    def check_resp_protocol(self, port):
+        """Strict RESP check: anything but PONG from a reachable server is an error"""
+        result = subprocess.run(
+            ['redis-cli', '-p', str(port), 'PING'],
+            capture_output=True, text=True, timeout=5
+        )
+        if result.returncode == 0 and result.stdout.strip() == 'PONG':
+            return {'status': 'healthy', 'details': 'Redis PING successful'}
+
+        # redis-cli writes error replies to stdout or stderr depending on version
+        output = (result.stdout + result.stderr).strip()
+        if 'Could not connect' not in output:
+            reply = output or f'exit code {result.returncode}'
+            return {'status': 'error', 'details': f'Redis PING failed: {reply}'}
+        return None
+
+    def check_http_protocol(self, port):
+        """Strict HTTP check: a non-200 reply from /health and / is an error"""
+        status_code = None
+        for path in ('/health', '/'):
+            try:
+                response = requests.get(f'http://localhost:{port}{path}', timeout=5)
+            except requests.RequestException:
+                continue
+            if response.status_code == 200:
+                return {'status': 'healthy', 'details': f'HTTP {path} returned 200'}
+            status_code = response.status_code
+
+        if status_code is not None:
+            return {'status': 'error', 'details': f'HTTP health check returned {status_code}'}
+        return None
+
     def check_service_health(self, service_name, port):
         """Check health of specific service"""
+        protocol = self.service_protocols.get(service_name)
         try:
-            if service_name == 'postgresql':
+            if protocol in ('resp', 'http', 'tcp'):
+                # Opted-in services skip the name-based checks; a None result
+                # means nothing answered, leaving reachability to the port check
+                status = None
+                if protocol == 'resp':
+                    status = self.check_resp_protocol(port)
+                elif protocol == 'http':
+                    status = self.check_http_protocol(port)
+                if status is not None:
+                    return status
+
+            elif service_name == 'postgresql':
                 # Check PostgreSQL with proper connection
                 import psycopg2
                 conn = psycopg2.connect(
@@ -88,18 +135,19 @@ class ServiceMonitor:
                     return {'status': 'healthy', 'details': 'Redis PING successful'}
 
             elif service_name in ['chromadb', 'faiss', 'haystack']:
-                # Check HTTP-based services
+                # Check HTTP-based services; fall back to / when there is no /health route
                 try:
                     response = requests.get(f'http://localhost:{port}/health', timeout=5)
                     if response.status_code == 200:
                         return {'status': 'healthy', 'details': 'HTTP health check passed'}
                 except:
-                    try:
-                        response = requests.get(f'http://localhost:{port}/', timeout=5)
-                        if response.status_code == 200:
-                            return {'status': 'healthy', 'details': 'HTTP root accessible'}
-                    except:
-                        pass
+                    pass
+                try:
+                    response = requests.get(f'http://localhost:{port}/', timeout=5)
+                    if response.status_code == 200:
+                        return {'status': 'healthy', 'details': 'HTTP root accessible'}
+                except:
+                    pass
 
             elif service_name == 'etcd':
                 # Check etcd health